@@ -2,81 +2,209 @@ import tkinter as tk
 from tkinter import ttk, messagebox
 import sqlite3
 import datetime
-import pandas as pd
-import matplotlib.pyplot as plt
+import queue
+import threading
+from collections import Counter
+from contextlib import contextmanager
 
 # ------------- Database Logic -------------
+# ISO-8601 so stored dates sort chronologically; parse with this explicit format too
+DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+# Statement text is kept constant so sqlite3's statement cache reuses the compiled plans
+_SQL_INSERT = 'INSERT INTO expenses (amount, category, date) VALUES (?, ?, ?)'
+_SQL_LAST_ID = 'SELECT last_insert_rowid()'
+_SQL_DELETE = 'DELETE FROM expenses WHERE id = ?'
+_SQL_SELECT_ONE = 'SELECT amount, category FROM expenses WHERE id = ?'
+_SQL_SELECT_PAGE_AT = 'SELECT id, amount, category, date FROM expenses ORDER BY date DESC, id DESC LIMIT ? OFFSET ?'
+_SQL_SELECT_NEXT_PAGE = 'SELECT id, amount, category, date FROM expenses WHERE (date, id) < (?, ?) ORDER BY date DESC, id DESC LIMIT ?'
+_SQL_COUNT = 'SELECT COUNT(*) FROM expenses'
+_SQL_CATEGORY_TOTALS = 'SELECT category, SUM(amount), COUNT(*) FROM expenses GROUP BY category'
+
 class DataStorage:
     def __init__(self, db_name="expenses.db"):
         self.db_name = db_name
+        # Long-lived connection used for reads on the Tk thread
+        self.conn = self._connect()
+        self.conn.row_factory = sqlite3.Row
         self._initialize_db()
 
-    def _initialize_db(self):
-        with sqlite3.connect(self.db_name) as conn:
-            cursor = conn.cursor()
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS expenses (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    amount REAL NOT NULL,
-                    category TEXT NOT NULL,
-                    date TEXT NOT NULL
-                )
-            ''')
-            conn.commit()
+        # Running per-category totals so the pie chart never has to re-read the table
+        self._cat_totals = Counter()
+        self._cat_counts = Counter()
+        for row in self.conn.execute(_SQL_CATEGORY_TOTALS):
+            self._cat_totals[row[0]] = row[1]
+            self._cat_counts[row[0]] = row[2]
+
+        # Writes run on a worker thread with its own connection so commits never block the UI;
+        # finished writes wait in _results until process_results() is called on the Tk thread
+        self._requests = queue.Queue()
+        self._results = queue.Queue()
+        self._worker = threading.Thread(target=self._db_worker, daemon=True)
+        self._worker.start()
+
+    def _connect(self):
+        conn = sqlite3.connect(self.db_name, check_same_thread=False, isolation_level=None, cached_statements=256)
+        # NORMAL sync under WAL avoids an fsync on every commit; these settings are per connection
+        conn.executescript('''
+            PRAGMA synchronous=NORMAL;
+            PRAGMA temp_store=MEMORY;
+            PRAGMA cache_size=-8000;
+        ''')
+        return conn
 
-    def add_expense(self, amount, category, date):
-        with sqlite3.connect(self.db_name) as conn:
-            cursor = conn.cursor()
-            cursor.execute('''
-                INSERT INTO expenses (amount, category, date)
-                VALUES (?, ?, ?)
-            ''', (amount, category, date))
-            conn.commit()
-
-    def delete_expense(self, expense_id):
-        with sqlite3.connect(self.db_name) as conn:
-            cursor = conn.cursor()
-        # Delete selected expense
-            cursor.execute('DELETE FROM expenses WHERE id = ?', (expense_id,))
-            conn.commit()
-
-        # Rebuild table with new IDs
+    def _initialize_db(self):
+        # WAL is stored in the database file, so readers no longer block the writer
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        cursor = self.conn.cursor()
         cursor.execute('''
-            CREATE TABLE IF NOT EXISTS temp_expenses (
+            CREATE TABLE IF NOT EXISTS expenses (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
                 amount REAL NOT NULL,
                 category TEXT NOT NULL,
                 date TEXT NOT NULL
             )
         ''')
-        cursor.execute('INSERT INTO temp_expenses (amount, category, date) SELECT amount, category, date FROM expenses')
-        cursor.execute('DROP TABLE expenses')
-        cursor.execute('ALTER TABLE temp_expenses RENAME TO expenses')
-        conn.commit()
+        # (date, id) is a unique sort key, so a page can resume right after the last row loaded
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_expenses_date_id ON expenses(date DESC, id DESC)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_expenses_category ON expenses(category)')
 
+        # Schema v1: dates move from dd-mm-YYYY to ISO-8601 so they sort chronologically
+        version = cursor.execute('PRAGMA user_version').fetchone()[0]
+        if version < 1:
+            cursor.execute('''
+                UPDATE expenses
+                SET date = substr(date, 7, 4) || '-' || substr(date, 4, 2) || '-' || substr(date, 1, 2) || substr(date, 11)
+                WHERE date GLOB '[0-9][0-9]-[0-9][0-9]-[0-9][0-9][0-9][0-9]*'
+            ''')
+            cursor.execute('PRAGMA user_version = 1')
+
+    def _db_worker(self):
+        conn = self._connect()
+        while True:
+            request = self._requests.get()
+            if request is None:
+                break
+            write, args, on_done = request
+            try:
+                self._results.put((on_done, write(conn, *args), None))
+            except Exception as exc:
+                # Hand every failure back to the Tk thread so the worker keeps serving later writes
+                self._results.put((on_done, None, exc))
+        conn.close()
+
+    def process_results(self):
+        # Must be called from the Tk thread; runs the callbacks of finished writes
+        while True:
+            try:
+                on_done, result, error = self._results.get_nowait()
+            except queue.Empty:
+                return
+            if error is not None:
+                raise error
+            on_done(result)
+
+    @staticmethod
+    @contextmanager
+    def _transaction(conn):
+        # The connection is in autocommit mode, so `with conn:` would not open a transaction
+        conn.execute('BEGIN')
+        try:
+            yield
+            conn.execute('COMMIT')
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+
+    @staticmethod
+    def _insert_many(conn, rows):
+        # One transaction for the whole batch instead of one commit per row
+        # Returns the id of the last row inserted; executemany leaves cursor.lastrowid unset
+        with DataStorage._transaction(conn):
+            conn.executemany(_SQL_INSERT, rows)
+            return conn.execute(_SQL_LAST_ID).fetchone()[0]
+
+    @staticmethod
+    def _delete(conn, expense_id):
+        with DataStorage._transaction(conn):
+            row = conn.execute(_SQL_SELECT_ONE, (expense_id,)).fetchone()
+            if row is not None:
+                conn.execute(_SQL_DELETE, (expense_id,))
+        return row
+
+    def _count_expense(self, amount, category):
+        self._cat_totals[category] += amount
+        self._cat_counts[category] += 1
+
+    def add_expense(self, amount, category, date, callback=None):
+        self.add_expenses([(amount, category, date)], callback)
+
+    def add_expenses(self, rows, callback=None):
+        rows = list(rows)
+        def on_done(last_id):
+            for amount, category, _ in rows:
+                self._count_expense(amount, category)
+            if callback:
+                callback(last_id)
+        self._requests.put((self._insert_many, (rows,), on_done))
+
+    def delete_expense(self, expense_id, callback=None):
+        def on_done(row):
+            if row is not None:
+                amount, category = row
+                self._cat_counts[category] -= 1
+                if self._cat_counts[category]:
+                    self._cat_totals[category] -= amount
+                else:
+                    del self._cat_counts[category]
+                    del self._cat_totals[category]
+            if callback:
+                callback(row)
+        self._requests.put((self._delete, (expense_id,), on_done))
+
+    def get_expenses_page(self, after=None, limit=1000, offset=0):
+        # Keyset paging after the row `after`, or a jump to position `offset` when it is None.
+        # Each page is read in full so no cursor stays open to pin an old snapshot.
+        # Returns (id, amount, category, date) tuples; plain tuples skip the per-row sqlite3.Row allocation
+        cursor = self.conn.cursor()
+        cursor.row_factory = None
+        if after is None:
+            cursor.execute(_SQL_SELECT_PAGE_AT, (limit, offset))
+        else:
+            expense_id, _, _, date = after
+            cursor.execute(_SQL_SELECT_NEXT_PAGE, (date, expense_id, limit))
+        return cursor.fetchall()
+
+    def count_expenses(self):
+        return self.conn.execute(_SQL_COUNT).fetchone()[0]
+
+    def get_category_totals(self):
+        return dict(self._cat_totals)
 
-    def get_all_expenses(self):
-        with sqlite3.connect(self.db_name) as conn:
-            conn.row_factory = sqlite3.Row
-            cursor = conn.cursor()
-            cursor.execute('SELECT * FROM expenses ORDER BY date DESC')
-            return [dict(row) for row in cursor.fetchall()]
+    def close(self):
+        # Let queued writes finish before closing
+        self._requests.put(None)
+        self._worker.join()
+        self.conn.close()
 
 # ------------- Chart Drawing -------------
-def create_pie_chart(expenses):
-    if not expenses:
+def create_pie_chart(category_totals):
+    if not category_totals:
         messagebox.showinfo("Info", "No expenses to show.")
         return
 
-    df = pd.DataFrame(expenses)
-    category_totals = df.groupby('category')['amount'].sum()
+    # Imported on first use so the window opens without loading matplotlib
+    import matplotlib.pyplot as plt
 
+    labels, totals = zip(*category_totals.items())
     fig, ax = plt.subplots()
-    ax.pie(category_totals, labels=category_totals.index, autopct='%1.1f%%', startangle=90)
+    ax.pie(totals, labels=labels, autopct='%1.1f%%', startangle=90)
     ax.set_title('Expense Breakdown by Category')
     plt.show()
 
 # ------------- Main App UI -------------
+_PAGE_SIZE = 1000
+
 class ExpenseTrackerApp:
     def __init__(self, root):
         self.root = root
@@ -86,10 +214,19 @@ class ExpenseTrackerApp:
 
         self.storage = DataStorage()
         self.selected_expense_id = None
+        self._select_after = None
+        self._all_rows = []
+        self._rows_offset = 0
+        self._more_rows = False
+        self._row_total = 0
+        self.first_visible_index = 0
         self.is_dark_mode = False
 
         self.setup_ui()
         self.load_expenses()
+        self.poll_storage()
+
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
 
     def setup_ui(self):
         # Frames
@@ -127,14 +264,41 @@ class ExpenseTrackerApp:
         for col in columns:
             self.expense_table.heading(col, text=col)
             self.expense_table.column(col, width=100, anchor="center")
+        # Only the visible window of rows lives in the Treeview, so the scrollbar drives our own cursor
+        self.table_scrollbar = ttk.Scrollbar(self.right_frame, orient="vertical", command=self.on_table_scroll)
+        self.table_scrollbar.pack(side="right", fill="y")
         self.expense_table.pack(expand=True, fill="both")
 
         self.expense_table.bind("<<TreeviewSelect>>", self.on_row_select)
+        self.expense_table.bind("<Configure>", lambda event: self.render_visible_rows())
+        self.expense_table.bind("<MouseWheel>", self.on_mouse_wheel)
+        self.expense_table.bind("<Button-4>", lambda event: self.scroll_rows(-1))
+        self.expense_table.bind("<Button-5>", lambda event: self.scroll_rows(1))
+        self.expense_table.bind("<Up>", lambda event: self.move_selection(-1))
+        self.expense_table.bind("<Down>", lambda event: self.move_selection(1))
+        self.expense_table.bind("<Prior>", lambda event: self.move_selection(-self.visible_row_count()))
+        self.expense_table.bind("<Next>", lambda event: self.move_selection(self.visible_row_count()))
+
+        # Cache each tk widget's light and dark colors once so toggling doesn't walk the widget tree
+        dark_colors = [(self.root, {"bg": "#2C2C2C"}), (self.left_frame, {"bg": "#2C2C2C"}), (self.right_frame, {"bg": "#333333"})]
+        dark_colors += [(widget, {"bg": "#2C2C2C", "fg": "white"}) for widget in self.left_frame.winfo_children() if not isinstance(widget, ttk.Widget)]
+        self._themed_widgets = [(widget, {option: widget.cget(option) for option in dark}, dark) for widget, dark in dark_colors]
+
+        # ttk widgets are restyled in one call by switching between these two themes
+        self.style = ttk.Style(self.root)
+        base_theme = self.style.theme_use()
+        self.style.theme_create("expense-light", parent=base_theme)
+        self.style.theme_create("expense-dark", parent=base_theme, settings={
+            "TCombobox": {"configure": {"fieldbackground": "#3C3C3C", "foreground": "white"}},
+            "Treeview": {"configure": {"background": "#333333", "fieldbackground": "#333333", "foreground": "white"}},
+            "Treeview.Heading": {"configure": {"background": "#2C2C2C", "foreground": "white"}},
+        })
+        self.style.theme_use("expense-light")
 
     def add_expense(self):
         amount = self.amount_entry.get()
         category = self.category_combobox.get()
-        date = datetime.datetime.now().strftime("%d-%m-%Y %H:%M:%S")
+        date = datetime.datetime.now().strftime(DATE_FORMAT)
 
         if not amount or not category:
             messagebox.showerror("Input Error", "All fields are required.")
@@ -147,10 +311,18 @@ class ExpenseTrackerApp:
             messagebox.showerror("Input Error", "Amount must be a positive number.")
             return
         
-        self.storage.add_expense(amount, category, date)
-        self.load_expenses()
-        self.clear_inputs()
+        self.storage.add_expense(amount, category, date, callback=lambda expense_id: self.on_expense_added(expense_id, amount, category, date))
 
+    def on_expense_added(self, expense_id, amount, category, date):
+        # Newest expense goes on top; only the visible window is redrawn
+        if self._rows_offset:
+            self._rows_offset += 1
+        else:
+            self._all_rows.insert(0, (expense_id, amount, category, date))
+        self._row_total += 1
+        self.first_visible_index = 0
+        self.render_visible_rows()
+        self.clear_inputs()
         messagebox.showinfo("Success", "Expense added successfully!")
 
     def delete_expense(self):
@@ -158,23 +330,138 @@ class ExpenseTrackerApp:
             messagebox.showwarning("Selection Error", "Please select an expense to delete.")
             return
 
-        self.storage.delete_expense(self.selected_expense_id)
-        self.load_expenses()
+        expense_id = self.selected_expense_id
+        self.storage.delete_expense(expense_id, callback=lambda row: self.on_expense_deleted(expense_id, row))
+
+    def on_expense_deleted(self, expense_id, row):
+        remaining = [exp for exp in self._all_rows if exp[0] != expense_id]
+        if row is not None:
+            self._row_total -= 1
+            # The row had been evicted, so cached positions are off by one; reload the window
+            if len(remaining) == len(self._all_rows):
+                remaining = []
+        self._all_rows = remaining
+        self.render_visible_rows()
         self.clear_inputs()
         messagebox.showinfo("Success", "Expense deleted successfully!")
 
+    def poll_storage(self):
+        # Schedule the next poll first so a failing callback can't stop UI updates for good
+        self._poll_after = self.root.after(50, self.poll_storage)
+        try:
+            self.storage.process_results()
+        except Exception as exc:
+            # The worker forwards every failure here, not just sqlite3 errors
+            messagebox.showerror("Error", str(exc))
+
     def load_expenses(self):
-        expenses = self.storage.get_all_expenses()
+        self._all_rows = []
+        self._rows_offset = 0
+        self._row_total = self.storage.count_expenses()
+        self.first_visible_index = 0
+        self.render_visible_rows()
+
+    def fetch_rows(self, first, end):
+        # _all_rows caches a contiguous run of rows starting at table position _rows_offset
+        loaded_end = self._rows_offset + len(self._all_rows)
+        if not self._all_rows or first < self._rows_offset or first > loaded_end:
+            # Jumps outside the cache load the rows around the target directly instead of paging through
+            # everything in between; starting half a page early leaves room to scroll back up
+            self._rows_offset = max(0, first - _PAGE_SIZE // 2)
+            self._all_rows = self.storage.get_expenses_page(limit=_PAGE_SIZE, offset=self._rows_offset)
+            self._more_rows = len(self._all_rows) == _PAGE_SIZE
+        while self._more_rows and self._rows_offset + len(self._all_rows) < end:
+            page = self.storage.get_expenses_page(self._all_rows[-1], _PAGE_SIZE)
+            self._all_rows.extend(page)
+            self._more_rows = len(page) == _PAGE_SIZE
+
+        # Evict rows well behind the window so the cache stays around one page in size
+        stale = first - self._rows_offset - _PAGE_SIZE
+        if stale > 0:
+            del self._all_rows[:stale]
+            self._rows_offset += stale
+
+    def visible_row_count(self):
+        row_pixels = int(self.style.lookup("Treeview", "rowheight") or 20)
+        # One row's worth of height goes to the heading
+        return max(1, self.expense_table.winfo_height() // row_pixels - 1)
+
+    def render_visible_rows(self):
+        total = self._row_total
+        count = self.visible_row_count()
+        self.first_visible_index = max(0, min(self.first_visible_index, total - count))
+        first = self.first_visible_index
+        self.fetch_rows(first, first + count)
+
         self.expense_table.delete(*self.expense_table.get_children())
-        for exp in expenses:
-            self.expense_table.insert("", "end", values=(exp["id"], exp["amount"], exp["category"], exp["date"]))
+        # Show sequential row numbers; the real DB id is kept as the item iid
+        start = first - self._rows_offset
+        for number, (expense_id, amount, category, date) in enumerate(self._all_rows[start:start + count], first + 1):
+            self.expense_table.insert("", "end", iid=str(expense_id), values=(number, amount, category, date))
+        # Re-inserting items drops the highlight, so restore it for the expense still in the inputs
+        if self.selected_expense_id is not None and self.expense_table.exists(str(self.selected_expense_id)):
+            self.expense_table.selection_set(str(self.selected_expense_id))
+
+        if total:
+            self.table_scrollbar.set(first / total, min(1.0, (first + count) / total))
+        else:
+            self.table_scrollbar.set(0.0, 1.0)
 
-    def on_row_select(self, event):
+    def scroll_rows(self, delta):
+        self.first_visible_index += delta
+        self.render_visible_rows()
+
+    def move_selection(self, delta):
+        # The Treeview only holds the visible rows, so keyboard navigation walks the table and scrolls the window
+        if not self._row_total:
+            return "break"
         selected = self.expense_table.selection()
         if selected:
+            index = self.first_visible_index + self.expense_table.index(selected[0]) + delta
+        else:
+            index = self.first_visible_index
+        index = max(0, min(index, self._row_total - 1))
+
+        count = self.visible_row_count()
+        if index < self.first_visible_index:
+            self.first_visible_index = index
+        elif index >= self.first_visible_index + count:
+            self.first_visible_index = index - count + 1
+        self.render_visible_rows()
+
+        position = index - self._rows_offset
+        if 0 <= position < len(self._all_rows):
+            iid = str(self._all_rows[position][0])
+            self.expense_table.selection_set(iid)
+            self.expense_table.focus(iid)
+        return "break"
+
+    def on_mouse_wheel(self, event):
+        self.scroll_rows(-1 if event.delta > 0 else 1)
+
+    def on_table_scroll(self, action, amount, unit=None):
+        if action == "moveto":
+            self.first_visible_index = int(float(amount) * self._row_total)
+            self.render_visible_rows()
+        elif unit == "pages":
+            self.scroll_rows(int(amount) * self.visible_row_count())
+        else:
+            self.scroll_rows(int(amount))
+
+    def on_row_select(self, event):
+        # Coalesce bursts of selection events (e.g. holding an arrow key) into one update
+        if self._select_after is not None:
+            self.root.after_cancel(self._select_after)
+        self._select_after = self.root.after(30, self._apply_selection)
+
+    def _apply_selection(self):
+        self._select_after = None
+        selected = self.expense_table.selection()
+        # Re-highlighting the current expense after a re-render must not overwrite what the user typed
+        if selected and int(selected[0]) != self.selected_expense_id:
             item = self.expense_table.item(selected[0])
             values = item["values"]
-            self.selected_expense_id = values[0]
+            self.selected_expense_id = int(selected[0])
             self.amount_entry.delete(0, tk.END)
             self.amount_entry.insert(0, values[1])
             self.category_combobox.set(values[2])
@@ -185,24 +472,18 @@ class ExpenseTrackerApp:
         self.selected_expense_id = None
 
     def show_pie_chart(self):
-        expenses = self.storage.get_all_expenses()
-        create_pie_chart(expenses)
+        create_pie_chart(self.storage.get_category_totals())
+
+    def on_close(self):
+        self.root.after_cancel(self._poll_after)
+        self.storage.close()
+        self.root.destroy()
 
     def toggle_dark_mode(self):
-        if self.is_dark_mode:
-            self.root.configure(bg="#E3F6FD")
-            self.left_frame.configure(bg="#E3F6FD")
-            self.right_frame.configure(bg="#FFFFFF")
-            for widget in self.left_frame.winfo_children():
-                widget.configure(bg="#E3F6FD", fg="black")
-            self.is_dark_mode = False
-        else:
-            self.root.configure(bg="#2C2C2C")
-            self.left_frame.configure(bg="#2C2C2C")
-            self.right_frame.configure(bg="#333333")
-            for widget in self.left_frame.winfo_children():
-                widget.configure(bg="#2C2C2C", fg="white")
-            self.is_dark_mode = True
+        self.is_dark_mode = not self.is_dark_mode
+        for widget, light, dark in self._themed_widgets:
+            widget.configure(**(dark if self.is_dark_mode else light))
+        self.style.theme_use("expense-dark" if self.is_dark_mode else "expense-light")
 
 # ------------- Run App -------------
 if __name__ == "__main__":